@@ -1,13 +1,27 @@
 
 class InternalError(Exception):
+    __slots__ = ("message",)
+
     def __init__(self, message):
         self.message = message
         super().__init__(self.message)
 
 class NotSupportedInFppToJsonException(Exception):
+    __slots__ = ("field",)
+
     def __init__(self, field: str):
-        super().__init__(f"The {field} field is not supported in fpp-to-json")
+        self.field = field
+        super().__init__(field)
+
+    def __str__(self):
+        return f"The {self.field} field is not supported in fpp-to-json"
 
 class InvalidFppToJsonField(Exception):
+    __slots__ = ("field",)
+
     def __init__(self, field: str):
-        super().__init__(f"The {field} field is not valid")
+        self.field = field
+        super().__init__(field)
+
+    def __str__(self):
+        return f"The {self.field} field is not valid"
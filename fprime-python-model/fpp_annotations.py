@@ -0,0 +1,37 @@
+from fpp_ast_node import AstId
+from typing import Dict, List
+
+class Annotations:
+    """
+    Manage the pre and post annotations of AST nodes
+
+    Annotations are keyed by node id. For a member node such as
+    ModuleMemberDefArray, the key is the id of the node it wraps.
+    Only nonempty annotations are stored.
+    """
+    _pre: Dict[AstId, List[str]] = {}
+    _post: Dict[AstId, List[str]] = {}
+
+    @staticmethod
+    def put(id: AstId, pre: List[str], post: List[str]):
+        """
+        Put the annotations of a node into the map.
+        """
+        if pre:
+            Annotations._pre[id] = pre
+        if post:
+            Annotations._post[id] = post
+
+    @staticmethod
+    def get_pre(id: AstId) -> List[str]:
+        """
+        Get the pre annotation of a node. Return an empty list if there is none.
+        """
+        return Annotations._pre.get(id, [])
+
+    @staticmethod
+    def get_post(id: AstId) -> List[str]:
+        """
+        Get the post annotation of a node. Return an empty list if there is none.
+        """
+        return Annotations._post.get(id, [])
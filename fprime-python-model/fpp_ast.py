@@ -1,18 +1,25 @@
+import sys
 from abc import ABC, abstractmethod
-from typing import List, TypeAlias, Optional, Tuple, override, TypeVar
-from dataclasses import dataclass
-from enum import Enum
+from typing import Any, Callable, List, TypeAlias, Optional, Tuple, override, TypeVar, ClassVar
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum, StrEnum
 from fpp_ast_node import AstNode
 from error import InternalError
 from fpp_locations import Locations
 
 T = TypeVar('T')
-Annotated: TypeAlias = Tuple[List[str], T, List[str]]
 Ident: TypeAlias = str
-type FormalParamList = List[Annotated[AstNode['FormalParam']]]
+type FormalParamList = List[AstNode['FormalParam']]
 TUMember: TypeAlias = 'ModuleMember'
 
-@dataclass
+def ident(s: str) -> Ident:
+    """
+    Construct an identifier. Identifiers are interned, so equal
+    identifiers share one string object.
+    """
+    return sys.intern(s)
+
+@dataclass(slots=True, eq=False)
 class TransUnit:
     """Translation unit"""
     members: List[TUMember]
@@ -27,52 +34,100 @@ class Binop(Enum):
     def __str__(self):
         return self.value
 
-class ComponentKind(Enum):
+class ComponentKind(StrEnum):
     """Component kind"""
     ACTIVE = "active"
     PASSIVE = "passive"
     QUEUED = "queued"
 
-    def __str__(self):
-        return self.value
+class NodeKind(IntEnum):
+    """
+    Node kind of a class that implements QualIdent, Expr, TypeName,
+    SpecConnectionGraph, TransitionOrDo, or SpecPortInstance
+
+    Each class stores its kind in node_kind, so a pass can dispatch through
+    a list indexed by kind. The classes are dataclasses, so a pass can also
+    dispatch with class patterns, e.g., case ExprBinop(e1, op, e2).
+    """
+    UNQUALIFIED = 0
+    QUALIFIED = 1
+    EXPR_ARRAY = 2
+    EXPR_BINOP = 3
+    EXPR_DOT = 4
+    EXPR_IDENT = 5
+    EXPR_LITERAL_BOOL = 6
+    EXPR_LITERAL_INT = 7
+    EXPR_LITERAL_FLOAT = 8
+    EXPR_LITERAL_STRING = 9
+    EXPR_PAREN = 10
+    EXPR_STRUCT = 11
+    EXPR_UNOP = 12
+    TYPE_NAME_FLOAT = 13
+    TYPE_NAME_INT = 14
+    TYPE_NAME_QUAL_IDENT = 15
+    TYPE_NAME_BOOL = 16
+    TYPE_NAME_STRING = 17
+    DIRECT = 18
+    PATTERN = 19
+    TRANSITION = 20
+    DO = 21
+    GENERAL = 22
+    SPECIAL = 23
 
 class QualIdent(ABC):
     """A possibly-qualified identifier"""
+    __slots__ = ()
+
     @abstractmethod
-    def to_ident_list(self) -> List[Ident]:
-        """Convert a qualified identifier to a list of identifiers"""
+    def to_ident_list(self) -> Tuple[Ident, ...]:
+        """Convert a qualified identifier to a sequence of identifiers"""
         pass
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Unqualified(QualIdent):
     """An unqualified identifier"""
+    node_kind: ClassVar[NodeKind] = NodeKind.UNQUALIFIED
     name: Ident
 
     @override
     def to_ident_list(self):
-        return [self.name]
+        return (self.name,)
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Qualified(QualIdent):
     """A qualified identifier"""
+    node_kind: ClassVar[NodeKind] = NodeKind.QUALIFIED
     qualifier: AstNode[QualIdent]
     name: AstNode[Ident]
+    # The identifier list, computed on first use
+    _ident_list: Optional[Tuple[Ident, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @override
     def to_ident_list(self):
-        return self.qualifier.data.to_ident_list + [self.name.data]
+        if self._ident_list is None:
+            names = [self.name.data]
+            qual_ident = self.qualifier.data
+            while isinstance(qual_ident, Qualified) and qual_ident._ident_list is None:
+                names.append(qual_ident.name.data)
+                qual_ident = qual_ident.qualifier.data
+            names.reverse()
+            self._ident_list = qual_ident.to_ident_list() + tuple(names)
+        return self._ident_list
 
 def qual_ident_from_node_list(node_list: 'NodeList') -> QualIdent:
     """
     Construct a qualified identifier from a node list
+    Each qualifier node takes the id of its last identifier node
     """
-    split_node_list = split(node_list)
-    if not split_node_list[0] and split_node_list[1]:
-        return Unqualified(split_node_list[1].data)
-    elif split_node_list[0] and split_node_list[1]:
-        qualifier_1 = qual_ident_from_node_list(split_node_list[0])
-        node = AstNode.create(qualifier_1, name(split_node_list[0])._id)
-        Qualified(node, split_node_list[1])
+    if not node_list:
+        raise InternalError("node list should not be empty")
+    qual_ident = Unqualified(node_list[0].data)
+    for i in range(1, len(node_list)):
+        node = AstNode.create_with_id(qual_ident, node_list[i - 1]._id)
+        qual_ident = Qualified(node, node_list[i])
+    return qual_ident
 
 NodeList: TypeAlias = List[AstNode[Ident]]
 """
@@ -84,19 +139,18 @@ def split(node_list: NodeList) -> Tuple[List[AstNode[Ident]], AstNode[Ident]]:
     """
     Split a qualified identifier list into qualifier and name
     """
-    rev: List[NodeList] = node_list.reverse()
-    if not rev:
+    if not node_list:
         raise InternalError("node list should not be empty")
     else:
-        return rev[1:].reverse(), rev[0]
+        return node_list[:-1], node_list[-1]
     
 def qualifier(node_list: NodeList) -> List[AstNode[Ident]]:
     """Get the qualifier"""
-    split(node_list)[0]
+    return split(node_list)[0]
 
 def name(node_list: NodeList) -> AstNode[Ident]:
     """Get the unqualified name"""
-    split(node_list)[1]
+    return split(node_list)[1]
     
 
 def node_from_node_list(node_list: NodeList) -> AstNode[QualIdent]:
@@ -111,16 +165,16 @@ def node_from_node_list(node_list: NodeList) -> AstNode[QualIdent]:
 ### Definitions
 ##########################
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefAbsType:
     name: Ident
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefAliasType:
     name: Ident
     type_name: AstNode['TypeName']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefArray:
     name: Ident
     size: AstNode['Expr']
@@ -128,13 +182,13 @@ class DefArray:
     default: Optional[AstNode['Expr']]
     format: Optional[AstNode[str]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefComponent:
     kind: ComponentKind
     name: Ident
     members: List['ComponentMember']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefComponentInstance:
     name: Ident
     component: AstNode[QualIdent]
@@ -145,168 +199,259 @@ class DefComponentInstance:
     stack_size: Optional[AstNode['Expr']]
     priority: Optional[AstNode['Expr']]
     cpu: Optional[AstNode['Expr']]
-    init_specs: List[Annotated[AstNode['SpecInit']]]
+    init_specs: List[AstNode['SpecInit']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefConstant:
     name: Ident
     value: AstNode['Expr']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefEnum:
     name: Ident
     type_name: Optional[AstNode['TypeName']]
-    constants: List[Annotated[AstNode['DefEnumConstant']]]
+    constants: List[AstNode['DefEnumConstant']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefEnumConstant:
     name: Ident
     value: Optional[AstNode['Expr']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefModule:
     name: Ident
     members: List['ModuleMember']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefPort:
     name: Ident
     params: FormalParamList
     return_type: Optional[AstNode['TypeName']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefStateMachine:
     name: Ident
     members: Optional[List['StateMachineMember']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefAction:
     name: Ident
     type_name: Optional[AstNode['TypeName']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefChoice:
     name: Ident
     guard: AstNode[Ident]
     if_transition: AstNode['TransitionExpr']
     else_transition: AstNode['TransitionExpr']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefGuard:
     name: Ident
     type_name: Optional[AstNode['TypeName']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefSignal:
     name: Ident
     type_name: Optional[AstNode['TypeName']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefState:
     name: Ident
     members: List['StateMember']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefInterface:
     name: Ident
     members: List['InterfaceMember']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefStruct:
     name: Ident
-    members: List[Annotated[AstNode['StructTypeMember']]]
+    members: List[AstNode['StructTypeMember']]
     default: Optional['InterfaceMember']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class DefTopology:
     name: Ident
     members: List['TopologyMember']
 
+##########################
+### Member Kinds
+##########################
+
+class MemberKind(IntEnum):
+    """Member node kind, shared by all member node classes"""
+    DEF_ABS_TYPE = 0
+    DEF_ACTION = 1
+    DEF_ALIAS_TYPE = 2
+    DEF_ARRAY = 3
+    DEF_CHOICE = 4
+    DEF_COMPONENT = 5
+    DEF_COMPONENT_INSTANCE = 6
+    DEF_CONSTANT = 7
+    DEF_ENUM = 8
+    DEF_GUARD = 9
+    DEF_INTERFACE = 10
+    DEF_MODULE = 11
+    DEF_PORT = 12
+    DEF_SIGNAL = 13
+    DEF_STATE = 14
+    DEF_STATE_MACHINE = 15
+    DEF_STRUCT = 16
+    DEF_TOPOLOGY = 17
+    SPEC_COMMAND = 18
+    SPEC_COMP_INSTANCE = 19
+    SPEC_CONNECTION_GRAPH = 20
+    SPEC_CONTAINER = 21
+    SPEC_EVENT = 22
+    SPEC_IMPORT_INTERFACE = 23
+    SPEC_INCLUDE = 24
+    SPEC_INITIAL_TRANSITION = 25
+    SPEC_INTERNAL_PORT = 26
+    SPEC_LOC = 27
+    SPEC_PARAM = 28
+    SPEC_PORT_INSTANCE = 29
+    SPEC_PORT_MATCHING = 30
+    SPEC_RECORD = 31
+    SPEC_STATE_ENTRY = 32
+    SPEC_STATE_EXIT = 33
+    SPEC_STATE_MACHINE_INSTANCE = 34
+    SPEC_STATE_TRANSITION = 35
+    SPEC_TLM_CHANNEL = 36
+    SPEC_TLM_PACKET = 37
+    SPEC_TLM_PACKET_SET = 38
+    SPEC_TOP_IMPORT = 39
+    TLM_CHANNEL_IDENTIFIER = 40
+
+MemberHandlers: TypeAlias = List[Optional[Callable[[Any], Any]]]
+"""
+A table of member handlers indexed by member kind
+"""
+
+def member_handlers() -> MemberHandlers:
+    """Create an empty member handler table"""
+    return [None] * len(MemberKind)
+
+def member_handler(handlers: MemberHandlers, kind: MemberKind):
+    """Register the decorated function as the handler for a member kind"""
+    def register(f: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        handlers[kind] = f
+        return f
+    return register
+
+def dispatch_member(handlers: MemberHandlers, member):
+    """
+    Call the handler for a member node. Raise InternalError if no handler
+    is registered for its kind.
+    """
+    handler = handlers[member.kind]
+    if handler is None:
+        raise InternalError(f"no handler for member kind {member.kind.name}")
+    return handler(member)
+
 ##########################
 ### Component Member
 ##########################
 
 class ComponentMemberNode(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
-class ComponentMember:
-    node: Annotated[ComponentMemberNode]
+ComponentMember: TypeAlias = ComponentMemberNode
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberDefAbsType(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ABS_TYPE
     node: AstNode[DefAbsType]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberDefAliasType(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ALIAS_TYPE
     node: AstNode[DefAliasType]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberDefArray(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ARRAY
     node: AstNode[DefArray]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberDefConstant(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_CONSTANT
     node: AstNode[DefConstant]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberDefEnum(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ENUM
     node: AstNode[DefEnum]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberDefStateMachine(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_STATE_MACHINE
     node: AstNode[DefStateMachine]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberDefStruct(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_STRUCT
     node: AstNode[DefStruct]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecCommand(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_COMMAND
     node: AstNode['SpecCommand']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecContainer(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_CONTAINER
     node: AstNode['SpecContainer']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecEvent(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_EVENT
     node: AstNode['SpecEvent']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecInclude(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_INCLUDE
     node: AstNode['SpecInclude']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecInternalPort(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_INTERNAL_PORT
     node: AstNode['SpecInternalPort']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecParam(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_PARAM
     node: AstNode['SpecParam']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecPortInstance(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_PORT_INSTANCE
     node: AstNode['SpecPortInstance']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecPortMatching(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_PORT_MATCHING
     node: AstNode['SpecPortMatching']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecRecord(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_RECORD
     node: AstNode['SpecRecord']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecStateMachineInstance(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_STATE_MACHINE_INSTANCE
     node: AstNode['SpecStateMachineInstance']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecTlmChannel(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_TLM_CHANNEL
     node: AstNode['SpecTlmChannel']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ComponentMemberSpecImportInterface(ComponentMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_IMPORT_INTERFACE
     node: AstNode['SpecImport']
 
 ##########################
@@ -314,140 +459,161 @@ class ComponentMemberSpecImportInterface(ComponentMemberNode):
 ##########################
 
 class ModuleMemberNode(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
-class ModuleMember:
-    node: Annotated[ModuleMemberNode]
+ModuleMember: TypeAlias = ModuleMemberNode
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefAbsType(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ABS_TYPE
     node: AstNode[DefAbsType]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefAliasType(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ALIAS_TYPE
     node: AstNode[DefAliasType]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefArray(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ARRAY
     node: AstNode[DefArray]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefComponent(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_COMPONENT
     node: AstNode[DefComponent]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefComponentInstance(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_COMPONENT_INSTANCE
     node: AstNode[DefComponentInstance]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefConstant(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_CONSTANT
     node: AstNode[DefConstant]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefEnum(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ENUM
     node: AstNode[DefEnum]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefInterface(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_INTERFACE
     node: AstNode['DefInterface']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefModule(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_MODULE
     node: AstNode[DefModule]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefPort(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_PORT
     node: AstNode['DefPort']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefStateMachine(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_STATE_MACHINE
     node: AstNode['DefStateMachine']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefStruct(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_STRUCT
     node: AstNode['DefStruct']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberDefTopology(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_TOPOLOGY
     node: AstNode['DefTopology']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberSpecInclude(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_INCLUDE
     node: AstNode['SpecInclude']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ModuleMemberSpecLoc(ModuleMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_LOC
     node: AstNode['SpecLoc']
 
 ##########################
 ### State Machine Member
 ##########################
 
-@dataclass
-class StateMachineMember:
-    node: Annotated['StateMachineMemberNode']
-
 class StateMachineMemberNode(ABC):
-    pass
+    __slots__ = ()
+
+StateMachineMember: TypeAlias = StateMachineMemberNode
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMachineMemberDefAction(StateMachineMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_ACTION
     node: AstNode['DefAction']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMachineMemberDefChoice(StateMachineMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_CHOICE
     node: AstNode['DefChoice']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMachineMemberDefGuard(StateMachineMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_GUARD
     node: AstNode['DefGuard']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMachineMemberDefSignal(StateMachineMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_SIGNAL
     node: AstNode['DefSignal']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMachineMemberDefState(StateMachineMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_STATE
     node: AstNode['DefState']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMachineMemberDefSpecInitialTransition(StateMachineMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_INITIAL_TRANSITION
     node: AstNode['SpecInitialTransition']
 
 ##########################
 ### State Member
 ##########################
 
-@dataclass
-class StateMember:
-    node: Annotated['StateMemberNode']
-
 class StateMemberNode(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
+StateMember: TypeAlias = StateMemberNode
+
+@dataclass(slots=True, eq=False)
 class StateMemberDefChoice(StateMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_CHOICE
     node: AstNode[DefChoice]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMemberDefState(StateMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.DEF_STATE
     node: AstNode[DefState]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMemberSpecStateEntry(StateMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_STATE_ENTRY
     node: AstNode['SpecStateEntry']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMemberSpecStateExit(StateMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_STATE_EXIT
     node: AstNode['SpecStateExit']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMemberSpecInitialTransition(StateMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_INITIAL_TRANSITION
     node: AstNode['SpecInitialTransition']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StateMemberSpecStateTransition(StateMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_STATE_TRANSITION
     node: AstNode['SpecStateTransition']
 
 ##########################
@@ -455,53 +621,64 @@ class StateMemberSpecStateTransition(StateMemberNode):
 ##########################
 
 class Expr(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprArray(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_ARRAY
     elts: List[AstNode[Expr]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprBinop(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_BINOP
     e1: AstNode[Expr]
     op: 'Binop'
     e2: AstNode[Expr]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprDot(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_DOT
     e: AstNode[Expr]
     id: AstNode[Ident]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprIdent(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_IDENT
     value: Ident
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprLiteralBool(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_LITERAL_BOOL
     value: 'LiteralBool'
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprLiteralInt(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_LITERAL_INT
     value: str
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprLiteralFloat(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_LITERAL_FLOAT
     value: str
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprLiteralString(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_LITERAL_STRING
     value: str
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprParen(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_PAREN
     e: AstNode[Expr]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprStruct(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_STRUCT
     members: List[AstNode['StructMember']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExprUnop(Expr):
+    node_kind: ClassVar[NodeKind] = NodeKind.EXPR_UNOP
     op: 'Unop'
     e: AstNode[Expr]
 
@@ -510,30 +687,33 @@ class ExprUnop(Expr):
 ##########################
 
 class TopologyMemberNode(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
-class TopologyMember:
-    node: Annotated[TopologyMemberNode]
+TopologyMember: TypeAlias = TopologyMemberNode
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TopologyMemberSpecCompInstance(TopologyMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_COMP_INSTANCE
     node: AstNode['SpecCompInstance']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TopologyMemberSpecConnectionGraph(TopologyMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_CONNECTION_GRAPH
     node: AstNode['SpecConnectionGraph']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TopologyMemberSpecInclude(TopologyMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_INCLUDE
     node: AstNode['SpecInclude']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TopologyMemberSpecTlmPacketSet(TopologyMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_TLM_PACKET_SET
     node: AstNode['SpecTlmPacketSet']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TopologyMemberSpecTopImport(TopologyMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_TOP_IMPORT
     node: AstNode['SpecImport']
 
 #################################
@@ -541,37 +721,37 @@ class TopologyMemberSpecTopImport(TopologyMemberNode):
 #################################
 
 class TlmPacketSetMemberNode(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
-class TlmPacketSetMember:
-    node: Annotated[TlmPacketSetMemberNode]
+TlmPacketSetMember: TypeAlias = TlmPacketSetMemberNode
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TlmPacketSetMemberSpecInclude(TlmPacketSetMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_INCLUDE
     node: AstNode['SpecInclude']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TlmPacketSetMemberSpecTlmPacket(TlmPacketSetMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_TLM_PACKET
     node: AstNode['SpecTlmPacket']
 
 ############################
 ### Interface Member
 ############################
 
-@dataclass
-class InterfaceMember:
-    node: Annotated['InterfaceMemberNode']
-
 class InterfaceMemberNode(ABC):
-    pass
+    __slots__ = ()
+
+InterfaceMember: TypeAlias = InterfaceMemberNode
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class InterfaceMemberSpecPortInstance(InterfaceMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_PORT_INSTANCE
     node: AstNode['SpecPortInstance']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class InterfaceMemberSpecImportInterface(InterfaceMemberNode):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_IMPORT_INTERFACE
     node: AstNode['SpecImport']
 
 ###############################
@@ -579,14 +759,16 @@ class InterfaceMemberSpecImportInterface(InterfaceMemberNode):
 ###############################
 
 class TlmPacketMember(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TlmPacketMemberSpecInclude(TlmPacketMember):
+    kind: ClassVar[MemberKind] = MemberKind.SPEC_INCLUDE
     node: AstNode['SpecInclude']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TlmPacketMemberTlmChannelIdentifier(TlmPacketMember):
+    kind: ClassVar[MemberKind] = MemberKind.TLM_CHANNEL_IDENTIFIER
     node: AstNode['TlmChannelIdentifier']
 
 
@@ -594,16 +776,13 @@ class TlmPacketMemberTlmChannelIdentifier(TlmPacketMember):
 ### Specifiers
 ##########################
 
-class QueueFull(Enum):
+class QueueFull(StrEnum):
     ASSERT = "assert"
     BLOCK = "block"
     DROP = "drop"
     HOOK = "hook"
 
-    def __str__(self):
-        return self.value
-
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecCommand:
     kind: 'SpecCommandKind'
     name: Ident
@@ -620,16 +799,17 @@ class SpecCommandKind(Enum):
     def __str__(self):
         return self.value
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecCompInstance:
     visibility: 'Visibility'
     instance: AstNode[QualIdent]
 
 class SpecConnectionGraph(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Direct(SpecConnectionGraph):
+    node_kind: ClassVar[NodeKind] = NodeKind.DIRECT
     name: Ident
     connections: List['Connection']
 
@@ -645,13 +825,14 @@ class PatternKind(Enum):
     def __str__(self):
         return self.value
     
-@dataclass
+@dataclass(slots=True, eq=False)
 class Pattern(SpecConnectionGraph):
+    node_kind: ClassVar[NodeKind] = NodeKind.PATTERN
     kind: PatternKind
     source: AstNode[QualIdent]
     targets: List[AstNode[QualIdent]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Connection:
     isUnmatched: bool
     fromPort: AstNode['PortInstanceIdentifier']
@@ -659,13 +840,13 @@ class Connection:
     toPort: AstNode['PortInstanceIdentifier']
     toIndex: Optional[AstNode[Expr]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecContainer:
     name: Ident
     id: Optional[AstNode[Expr]]
     default_priority: Optional[AstNode[Expr]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecEvent:
     name: Ident
     params: FormalParamList
@@ -680,33 +861,32 @@ class SpecEventSeverity(Enum):
     WARNING_HIGH = "warning high"
     WARNING_LOW = "warning low"
 
-    # override __str__ function to return the event string
     def __str__(self):
         return self.value
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecInclude:
     file: AstNode[str]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecInit:
     phase: AstNode[Expr]
     code: str
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecInternalPort:
     name: Ident
     params: FormalParamList
     priority: Optional[AstNode[Expr]]
     queue_full: Optional[QueueFull]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecLoc:
     kind: 'SpecLocKind'
     symbol: AstNode[QualIdent]
     file: AstNode[str]
 
-class SpecLocKind(Enum):
+class SpecLocKind(StrEnum):
     COMPONENT = "component"
     COMPONENT_INSTANCE = "instance"
     CONSTANT = "constant"
@@ -716,10 +896,7 @@ class SpecLocKind(Enum):
     TYPE = "type "
     INTERFACE = "interface"
 
-    def __str__(self):
-        return self.value
-
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecParam:
     name: Ident
     type_name: AstNode['TypeName']
@@ -730,10 +907,11 @@ class SpecParam:
     is_external: bool
 
 class SpecPortInstance(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class General(SpecPortInstance):
+    node_kind: ClassVar[NodeKind] = NodeKind.GENERAL
     kind: 'GeneralKind'
     name: Ident
     size: Optional[AstNode[Expr]]
@@ -741,22 +919,20 @@ class General(SpecPortInstance):
     priority: Optional[AstNode[Expr]]
     queue_full: Optional[AstNode[QueueFull]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Special(SpecPortInstance):
+    node_kind: ClassVar[NodeKind] = NodeKind.SPECIAL
     input_kind: Optional['SpecialInputKind']
     kind: 'SpecialKind'
     name: Ident
     priority: Optional[AstNode[Expr]]
     queue_full: Optional[AstNode[QueueFull]]
 
-class GeneralKind(Enum):
+class GeneralKind(StrEnum):
     ASYNC_INPUT = "async input"
     GUARDED_INPUT = "guarded input"
     OUTPUT = "output"
     SYNC_INPUT = "sync input"
-
-    def __str__(self):
-        return self.value
     
 class SpecialInputKind(Enum):
     ASYNC = "async"
@@ -784,26 +960,26 @@ class SpecialKind(Enum):
     def __str__(self):
         return self.value
     
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecPortMatching:
     port1: AstNode[Ident]
     port2: AstNode[Ident]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecRecord:
     name: Ident
     record_type: AstNode['TypeName']
     is_array: bool
     id: Optional[AstNode[Expr]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecStateMachineInstance:
     name: Ident
     state_machine: AstNode[QualIdent]
     priority: Optional[AstNode[Expr]]
     queue_full: Optional[QueueFull]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecTlmChannel:
     name: Ident
     type_name: AstNode['TypeName']
@@ -813,43 +989,40 @@ class SpecTlmChannel:
     low: List['Limit']
     high: List['Limit']
 
-class SpecTlmChannelUpdate(Enum):
+class SpecTlmChannelUpdate(StrEnum):
     ALWAYS = "always"
     ON_CHANGE = "on change"
-
-    def __str__(self):
-        return self.value
     
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecTlmPacket:
     name: Ident
     id: Optional[AstNode[Expr]]
     group: AstNode[Expr]
     members: List['TlmPacketMember']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecTlmPacketSet:
     name: Ident
     members: List['TlmPacketSetMember']
     omitted: List[AstNode['TlmChannelIdentifier']]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecImport:
     sym: AstNode[QualIdent]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecInitialTransition:
     transition: AstNode['TransitionExpr']
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecStateEntry:
     actions: List[AstNode[Ident]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecStateExit:
     actions: List[AstNode[Ident]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SpecStateTransition:
     signal: AstNode[Ident]
     guard: Optional[AstNode[Ident]]
@@ -857,22 +1030,16 @@ class SpecStateTransition:
 
 Limit: TypeAlias = Tuple[AstNode['LimitKind'], AstNode[Expr]]
 
-class LimitKind(Enum):
+class LimitKind(StrEnum):
     RED = "red"
     ORANGE = "orange"
     YELLOW = "yellow"
 
-    def __str__(self):
-        return self.value
-
-class TypeFloat(Enum):
+class TypeFloat(StrEnum):
     F32 = "F32"
     F64 = "F64"
 
-    def __str__(self):
-        return self.value
-
-class TypeInt(Enum):
+class TypeInt(StrEnum):
     I8 = "I8"
     I16 = "I16"
     I32 = "I32"
@@ -881,31 +1048,32 @@ class TypeInt(Enum):
     U16 = "U16"
     U32 = "U32"
     U64 = "U64"
-
-    def __str__(self):
-        return self.value
     
 class TypeName(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=False)
 class TypeNameFloat(TypeName):
+    node_kind: ClassVar[NodeKind] = NodeKind.TYPE_NAME_FLOAT
     name: TypeFloat
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=False)
 class TypeNameInt(TypeName):
+    node_kind: ClassVar[NodeKind] = NodeKind.TYPE_NAME_INT
     name: TypeInt
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TypeNameQualIdent(TypeName):
+    node_kind: ClassVar[NodeKind] = NodeKind.TYPE_NAME_QUAL_IDENT
     name: AstNode[QualIdent]
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=False)
 class TypeNameBool(TypeName):
-    pass
+    node_kind: ClassVar[NodeKind] = NodeKind.TYPE_NAME_BOOL
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TypeNameString(TypeName):
+    node_kind: ClassVar[NodeKind] = NodeKind.TYPE_NAME_STRING
     size: Optional[AstNode[Expr]]
 
 class Unop(Enum):
@@ -914,14 +1082,11 @@ class Unop(Enum):
     def __str__(self):
         return self.value
 
-class Visibility(Enum):
+class Visibility(StrEnum):
     PRIVATE = "private"
     PUBLIC = "public"
-
-    def __str__(self):
-        return self.value
     
-@dataclass
+@dataclass(slots=True, eq=False)
 class FormalParam:
     kind: 'FormalParamKind'
     name: Ident
@@ -931,48 +1096,46 @@ class FormalParamKind(Enum):
     REF = "ref"
     VALUE = "value"
 
-class LiteralBool(Enum):
+class LiteralBool(StrEnum):
     TRUE = "true"
     FALSE = "false"
 
-    # override __str__ function to return the literal bool string
-    def __str__(self):
-        return self.value
-
-@dataclass
+@dataclass(slots=True, eq=False)
 class PortInstanceIdentifier:
     component_instance: AstNode[QualIdent]
     port_name: AstNode[Ident]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TransitionExpr:
     actions: List[AstNode[Ident]]
     target: AstNode[QualIdent]
 
 class TransitionOrDo(ABC):
-    pass
+    __slots__ = ()
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Transition(TransitionOrDo):
+    node_kind: ClassVar[NodeKind] = NodeKind.TRANSITION
     transition: AstNode[TransitionExpr]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Do(TransitionOrDo):
+    node_kind: ClassVar[NodeKind] = NodeKind.DO
     actions: List[AstNode[Ident]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StructMember:
     name: Ident
     value: AstNode[Expr]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class StructTypeMember:
     name: Ident
     size: Optional[AstNode[Expr]]
     type_name: AstNode[TypeName]
     format: Optional[AstNode[str]]
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TlmChannelIdentifier:
     component_instance: AstNode[QualIdent]
     channel_name: AstNode[Ident]
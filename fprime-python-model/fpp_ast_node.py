@@ -1,28 +1,38 @@
+import itertools
 from dataclasses import dataclass
-from typing import Generic, TypeVar, ClassVar, TypeAlias
+from typing import Generic, TypeVar, TypeAlias
 
 T = TypeVar('T')
 AstId: TypeAlias = int
 
-@dataclass(frozen=True)
+# Generate the next identifier
+# Shared amongst all instances of AstNode
+_next_id = itertools.count().__next__
+
+@dataclass(frozen=True, slots=True, eq=False)
 class AstNode(Generic[T]):
     data: T
     _id: AstId
 
-    # The next identifier
-    # Class variable shared amongst all instances of the class
-    _next_id: ClassVar[AstId] = 0
-
-    @classmethod
-    def get_id(cls) -> AstId:
-        id0 = cls._next_id
-        cls._next_id = id0 + 1
-        return id0
+    get_id = staticmethod(_next_id)
 
     @classmethod
     def create(cls, data: T) -> 'AstNode[T]':
-        return cls(data, cls.get_id())
+        node = _new(cls)
+        _set_data(node, data)
+        _set_id(node, _next_id())
+        return node
     
     @classmethod
     def create_with_id(cls, data: T, id: AstId) -> 'AstNode[T]':
-        return cls(data, id)
+        node = _new(cls)
+        _set_data(node, data)
+        _set_id(node, id)
+        return node
+
+# Fast construction path for AstNode
+# The frozen __init__ sets each field through object.__setattr__,
+# so the factory methods set the slots through their descriptors instead
+_new = object.__new__
+_set_data = AstNode.data.__set__
+_set_id = AstNode._id.__set__
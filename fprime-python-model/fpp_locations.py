@@ -1,10 +1,11 @@
 from fpp_ast_node import AstId
 from error import InternalError
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Iterator, Sequence, Tuple
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     path: Path
     pos: str
@@ -13,39 +14,104 @@ class Location:
 class Locations:
     """
     Manage locations of AST nodes
+
+    The location fields are stored in parallel arrays indexed by AST node id.
+    A missing location has None in the path array.
+    put_all interns paths, so nodes from the same file share one Path.
     """
-    _map: Dict[AstId, Location] = {}
+    _paths: Dict[str, Path] = {}
+    _path: List[Optional[Path]] = []
+    _pos: List[Optional[str]] = []
+    _including: List[Optional[str]] = []
+
+    @staticmethod
+    def ensure(size: int):
+        """
+        Grow the location arrays to hold at least size entries.
+        """
+        n = len(Locations._path)
+        if size > n:
+            pad = [None] * (size - n)
+            Locations._path.extend(pad)
+            Locations._pos.extend(pad)
+            Locations._including.extend(pad)
 
     @staticmethod
     def put(id: AstId, loc: Location):
         """
         Put a location into the map.
         """
-        Locations._map[id] = loc
+        if id >= len(Locations._path):
+            Locations.ensure(id + 1)
+        Locations._path[id] = loc.path
+        Locations._pos[id] = loc.pos
+        Locations._including[id] = loc.includingLoc
+
+    @staticmethod
+    def put_all(entries: Sequence[Tuple[AstId, str, str, Optional[str]]]):
+        """
+        Put locations given as (id, file, pos, includingLoc) tuples into the map.
+        """
+        if not entries:
+            return
+        Locations.ensure(max(entry[0] for entry in entries) + 1)
+        paths = Locations._paths
+        path_list = Locations._path
+        pos_list = Locations._pos
+        including_list = Locations._including
+        for id, file, pos, includingLoc in entries:
+            path = paths.get(file)
+            if path is None:
+                path = paths[file] = Path(file)
+            path_list[id] = path
+            pos_list[id] = pos
+            including_list[id] = includingLoc
 
     @staticmethod
     def get(id: AstId) -> Location:
         """
         Get a location from the map. Raise InternalError if the location is not there.
         """
-        if id in Locations._map:
-            return Locations._map[id]
-        else:
+        loc = Locations.get_opt(id)
+        if loc is None:
             raise InternalError(f"unknown location for AST node {id}")
+        return loc
 
-    @staticmethod 
+    @staticmethod
     def get_opt(id: AstId) -> Optional[Location]:
         """
         Get an optional location from the map.
         """
-        return Locations._map.get(id)
-    
+        if id < 0 or id >= len(Locations._path):
+            return None
+        path = Locations._path[id]
+        pos = Locations._pos[id]
+        if path is None or pos is None:
+            return None
+        return Location(path, pos, Locations._including[id])
+
     @staticmethod
-    def get_map():
+    def get_map() -> 'LocationMap':
         """
         Get the location map as an immutable map.
+        The map is a read-only view of the stored locations; it is not copied.
         """
-        return Locations._map.copy()
+        return LocationMap()
+
+class LocationMap(Mapping[AstId, Location]):
+    """
+    A read-only view of the locations in Locations
+    """
+    __slots__ = ()
 
+    def __getitem__(self, id: AstId) -> Location:
+        loc = Locations.get_opt(id) if isinstance(id, int) else None
+        if loc is None:
+            raise KeyError(id)
+        return loc
 
+    def __iter__(self) -> Iterator[AstId]:
+        return (id for id, path in enumerate(Locations._path) if path is not None)
 
+    def __len__(self) -> int:
+        return len(Locations._path) - Locations._path.count(None)
@@ -1,173 +1,238 @@
-from fpp_locations import Locations, Location
+from fpp_locations import Locations, LocationMap
+from fpp_annotations import Annotations
 import json
-from typing import Dict, List, Callable, Any
+import mmap
+import sys
+from typing import Dict, List, Callable, Any, BinaryIO, Iterator, TypeVar
 import os
 from fpp_ast import *
 from fpp_ast_node import T, AstId
-from pathlib import Path
+from enum import Enum
 from error import NotSupportedInFppToJsonException, InvalidFppToJsonField
 
+# orjson is optional; fall back to the standard json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bind the AstNode factory once; looking up a classmethod binds a new method each time
+create_with_id = AstNode.create_with_id
+
 
 def read_ast_node(a_node: dict) -> Tuple[dict, AstId]:
-    return a_node["AstNode"]["data"], a_node["AstNode"]["id"]
+    ast_node = a_node["AstNode"]
+    return ast_node["data"], ast_node["id"]
+
+
+def read_optional(d: Any) -> Any:
+    """
+    Read an optional value, which is either "None" or a {"Some": value} dictionary
+    Return the value, or None if there is no value
+    """
+    return d["Some"] if d.__class__ is dict and "Some" in d else None
 
 
 def translate_string(d: dict) -> AstNode[str]:
     data, id = read_ast_node(d)
-    return AstNode.create_with_id(data, id)
+    return create_with_id(sys.intern(data), id)
 
 
 def translate_ident(d: dict) -> AstNode[Ident]:
     data, id = read_ast_node(d)
-    return AstNode.create_with_id(Ident(data), id)
+    return create_with_id(ident(data), id)
 
 
 def translate_qual_ident(d: dict) -> AstNode[QualIdent]:
+    # Walk down the qualifier chain, then build the nodes from the innermost out
+    chain = []
     data, id = read_ast_node(d)
-    if data.get("Unqualified"):
-        return AstNode.create_with_id(Unqualified(data["Unqualified"]["name"]), id)
-    elif data.get("Qualified"):
+    while data.get("Qualified"):
         qualified = data["Qualified"]
-        qualifier_dict = qualified["qualifier"]
-        return AstNode.create_with_id(
-            Qualified(
-                translate_qual_ident(qualifier_dict), translate_ident(qualified["name"])
-            ),
-            id,
-        )
-    # TODO: raise error
+        chain.append((qualified["name"], id))
+        data, id = read_ast_node(qualified["qualifier"])
+    if not data.get("Unqualified"):
+        raise Exception(f"Invalid qualified identifier dictionary {data}")
+    node = create_with_id(Unqualified(ident(data["Unqualified"]["name"])), id)
+    for name, id in reversed(chain):
+        node = create_with_id(Qualified(node, translate_ident(name)), id)
+    return node
 
 
-def translate_formal_params(params_list: List) -> List[Annotated[FormalParam]]:
+def translate_formal_params(params_list: List) -> FormalParamList:
     params = []
     for p in params_list:
         node = p[1]
         data, id = read_ast_node(node)
-        name = data["name"]
+        name = ident(data["name"])
         kind = FormalParamKind.REF
         if "Value" in data["kind"]:
             kind = FormalParamKind.VALUE
         type_name_node = translate_type_name(data["typeName"])
         formal_param = FormalParam(kind, name, type_name_node)
-        param_ast_node = AstNode.create_with_id(formal_param, id)
-        params.append(annotate(p[0], param_ast_node, p[2]))
+        param_ast_node = create_with_id(formal_param, id)
+        Annotations.put(id, p[0], p[2])
+        params.append(param_ast_node)
     return params
 
 
+# Primitive type names carry no node-specific data, so all nodes share them
+# The payload classes are frozen, so a shared payload cannot be changed
+_TYPE_NAME_FLOATS: Dict[str, TypeNameFloat] = {
+    t.value: TypeNameFloat(t) for t in TypeFloat
+}
+_TYPE_NAME_INTS: Dict[str, TypeNameInt] = {
+    t.value: TypeNameInt(t) for t in TypeInt
+}
+_TYPE_NAME_BOOL = TypeNameBool()
+
 def translate_type_name(tn: dict) -> AstNode[TypeName]:
     data, id = read_ast_node(tn)
     if "TypeNameFloat" in data:
-        name = list(data["TypeNameFloat"]["name"].keys())[0]
-        return AstNode.create_with_id(TypeNameFloat(name), id)
+        name = next(iter(data["TypeNameFloat"]["name"]))
+        type_name: Optional[TypeName] = _TYPE_NAME_FLOATS.get(name)
+        if type_name is None:
+            raise InvalidFppToJsonField(name)
+        return create_with_id(type_name, id)
     elif "TypeNameInt" in data:
-        name = list(data["TypeNameInt"]["name"].keys())[0]
-        return AstNode.create_with_id(TypeNameInt(name), id)
+        name = next(iter(data["TypeNameInt"]["name"]))
+        type_name = _TYPE_NAME_INTS.get(name)
+        if type_name is None:
+            raise InvalidFppToJsonField(name)
+        return create_with_id(type_name, id)
     elif "TypeNameQualIdent" in data:
-        return AstNode.create_with_id(
+        return create_with_id(
             TypeNameQualIdent(translate_qual_ident(data["TypeNameQualIdent"]["name"])),
             id,
         )
     elif "TypeNameBool" in data:
-        return AstNode.create_with_id(TypeNameBool(), id)
+        return create_with_id(_TYPE_NAME_BOOL, id)
     elif "TypeNameString" in data:
-        return AstNode.create_with_id(TypeNameString(None), id)
+        return create_with_id(TypeNameString(None), id)
     else:
         raise Exception(f"Invalid type name dictionary {data}")
 
 
-def translate_binop(d: dict) -> Binop:
-    if "Add" in d:
-        return Binop.ADD
-    elif "Sub" in d:
-        return Binop.SUB
-    elif "Mul" in d:
-        return Binop.MUL
-    elif "Div" in d:
-        return Binop.DIV
-    else:
-        raise Exception(f"Invalid Binop JSON {d}")
+E = TypeVar('E', bound=Enum)
+
+
+def pascal_case(name: str) -> str:
+    """Convert an enum member name such as TEXT_EVENT to Pascal case"""
+    return "".join(word.capitalize() for word in name.split("_"))
+
+
+def kind_translator(enum_cls: type[E]) -> Callable[[dict], E]:
+    """
+    Make a function that translates a kind dictionary such as {"TextEvent": {}}
+    The key of each enum member is its name in Pascal case
+    """
+    kinds = {pascal_case(member.name): member for member in enum_cls}
+
+    def translate_kind(d: dict) -> E:
+        kind = next(iter(d), None)
+        value = kinds.get(kind)
+        if value is None:
+            raise InvalidFppToJsonField(kind)
+        return value
+
+    return translate_kind
 
 
+translate_binop: Callable[[dict], Binop] = kind_translator(Binop)
+
+
+# Expression classes whose data is a single value field
+_EXPR_LEAVES: Dict[str, Callable[[Any], Expr]] = {
+    "ExprIdent": lambda value: ExprIdent(ident(value)),
+    "ExprLiteralBool": ExprLiteralBool,
+    "ExprLiteralFloat": ExprLiteralFloat,
+    "ExprLiteralInt": ExprLiteralInt,
+    "ExprLiteralString": ExprLiteralString,
+}
+
 def translate_expr(expr_dict: dict) -> AstNode[Expr]:
     data, id = read_ast_node(expr_dict)
-    if "ExprArray" in data:
-        elts = []
-        for e in data["ExprArray"]["elts"]:
-            elts.append(translate_expr(e))
-        return AstNode.create_with_id(ExprArray(elts), id)
-    elif "ExprBinop" in data:
-        return AstNode.create_with_id(
-            ExprBinop(
-                translate_expr(data["ExprBinop"]["e1"]),
-                translate_binop(data["ExprBinop"]["op"]),
-                translate_expr(data["ExprBinop"]["e2"]),
-            ),
-            id,
-        )
-    elif "ExprDot" in data:
-        return AstNode.create_with_id(
-            ExprDot(
-                translate_expr(data["ExprDot"]["e"]),
-                translate_ident(data["ExprDot"]["id"]),
-            ),
-            id,
-        )
-    elif "ExprIdent" in data:
-        return AstNode.create_with_id(ExprIdent(data["ExprIdent"]["value"]), id)
-    elif "ExprLiteralBool" in data:
-        return AstNode.create_with_id(
-            ExprLiteralBool(data["ExprLiteralBool"]["value"]), id
-        )
-    elif "ExprLiteralInt" in data:
-        return AstNode.create_with_id(
-            ExprLiteralInt(data["ExprLiteralInt"]["value"]), id
-        )
-    elif "ExprLiteralFloat" in data:
-        return AstNode.create_with_id(
-            ExprLiteralFloat(data["ExprLiteralFloat"]["value"]), id
-        )
-    elif "ExprLiteralString" in data:
-        return AstNode.create_with_id(
-            ExprLiteralString(data["ExprLiteralString"]["value"]), id
-        )
-    elif "ExprParen" in data:
-        raise Exception("Translation for ExprParen not implemented.")
-    elif "ExprStruct" in data:
-        members = []
-        for m in data["ExprStruct"]["members"]:
-            members.append(
-                AstNode.create_with_id(
-                    StructMember(
-                        m["AstNode"]["data"]["name"],
-                        translate_expr(m["AstNode"]["data"]["value"]),
-                    ),
-                    m["AstNode"]["id"],
-                )
-            )
-        return AstNode.create_with_id(ExprStruct(members), id)
-    elif "ExprUnop" in data:
-        return AstNode.create_with_id(
-            ExprUnop(Unop.MINUS, translate_expr(data["ExprUnop"]["e"])), id
-        )
-    else:
+    kind = next(iter(data), None)
+    if kind is None:
         raise Exception(f"Invalid expression dictionary {expr_dict}")
+    leaf = _EXPR_LEAVES.get(kind)
+    if leaf is not None:
+        return create_with_id(leaf(data[kind]["value"]), id)
+    # Translate the subexpressions in post order with an explicit work stack
+    # A work item is either an expression dictionary or a (kind, data, id)
+    # entry that builds a node from the translated subexpressions on top of
+    # the node stack
+    nodes = []
+    work = [expr_dict]
+    while work:
+        item = work.pop()
+        if item.__class__ is tuple:
+            kind, data, id = item
+            if kind == "ExprBinop":
+                e2 = nodes.pop()
+                expr = ExprBinop(nodes.pop(), translate_binop(data["op"]), e2)
+            elif kind == "ExprDot":
+                expr = ExprDot(nodes.pop(), translate_ident(data["id"]))
+            elif kind == "ExprUnop":
+                expr = ExprUnop(Unop.MINUS, nodes.pop())
+            elif kind == "ExprArray":
+                start = len(nodes) - len(data["elts"])
+                expr = ExprArray(nodes[start:])
+                del nodes[start:]
+            else:
+                start = len(nodes) - len(data["members"])
+                members = []
+                for m, value in zip(data["members"], nodes[start:]):
+                    m_data, m_id = read_ast_node(m)
+                    members.append(
+                        create_with_id(
+                            StructMember(ident(m_data["name"]), value), m_id
+                        )
+                    )
+                del nodes[start:]
+                expr = ExprStruct(members)
+            nodes.append(create_with_id(expr, id))
+            continue
+        data, id = read_ast_node(item)
+        kind = next(iter(data), None)
+        if kind is None:
+            raise Exception(f"Invalid expression dictionary {item}")
+        leaf = _EXPR_LEAVES.get(kind)
+        if leaf is not None:
+            nodes.append(create_with_id(leaf(data[kind]["value"]), id))
+            continue
+        expr_data = data[kind]
+        work.append((kind, expr_data, id))
+        if kind == "ExprBinop":
+            work.append(expr_data["e2"])
+            work.append(expr_data["e1"])
+        elif kind == "ExprDot" or kind == "ExprUnop":
+            work.append(expr_data["e"])
+        elif kind == "ExprArray":
+            work.extend(reversed(expr_data["elts"]))
+        elif kind == "ExprStruct":
+            for m in reversed(expr_data["members"]):
+                work.append(m["AstNode"]["data"]["value"])
+        elif kind == "ExprParen":
+            raise Exception("Translation for ExprParen not implemented.")
+        else:
+            raise Exception(f"Invalid expression dictionary {item}")
+    return nodes[0]
 
 
 def translate_transition_expr(te: dict) -> AstNode[TransitionExpr]:
-    data, _ = read_ast_node(te)
-    return TransitionExpr(
-        translate_actions(data["actions"]), translate_qual_ident(data["target"])
+    data, id = read_ast_node(te)
+    return create_with_id(
+        TransitionExpr(
+            translate_actions(data["actions"]), translate_qual_ident(data["target"])
+        ),
+        id,
     )
 
 
 def translate_transition_or_do(t: dict) -> AstNode[TransitionOrDo]:
     if "Transition" in t:
-        return Transition(
-            AstNode.create_with_id(
-                translate_transition_expr(t["Transition"]["transition"]),
-                t["Transition"]["transition"]["AstNode"]["id"],
-            )
-        )
+        return Transition(translate_transition_expr(t["Transition"]["transition"]))
     elif "Do" in t:
         return Do(translate_actions(t["Do"]["actions"]))
     else:
@@ -175,80 +240,46 @@ def translate_transition_or_do(t: dict) -> AstNode[TransitionOrDo]:
 
 
 def translate_actions(l: List) -> List[AstNode[Ident]]:
-    actions = []
-    for a in l:
-        actions.append(translate_ident(a))
-    return actions
+    return [translate_ident(a) for a in l]
 
 
-def annotate(l1: List[str], d: T, l2: List[str]) -> Annotated:
-    return [(l1, d, l2)]
+translate_limit_kind_data: Callable[[dict], LimitKind] = kind_translator(LimitKind)
 
 
 def translate_limit_kind(d: dict) -> AstNode[LimitKind]:
     data, id = read_ast_node(d)
-    limit_kind = LimitKind.RED
-    if "Yellow" in data:
-        limit_kind = LimitKind.YELLOW
-    elif "Orange" in data:
-        limit_kind = LimitKind.ORANGE
-    return AstNode.create_with_id(limit_kind, id)
-
-
-def translate_spec_tlm_channel_update(d: dict) -> SpecTlmChannelUpdate:
-    if "Always" in d:
-        return SpecTlmChannelUpdate.ALWAYS
-    elif "OnChange" in d:
-        return SpecTlmChannelUpdate.ON_CHANGE
-    else:
-        raise InvalidFppToJsonField("")
+    return create_with_id(translate_limit_kind_data(data), id)
+
+
+translate_spec_tlm_channel_update: Callable[[dict], SpecTlmChannelUpdate] = (
+    kind_translator(SpecTlmChannelUpdate)
+)
 
 
 def translate_limits(l: List) -> List[Limit]:
-    limits = []
-    for e in l:
-        limits.append((translate_limit_kind(e[0]), translate_expr(e[1])))
-    return limits
+    return [(translate_limit_kind(e[0]), translate_expr(e[1])) for e in l]
 
 
-def translate_spec_command_kind(d: dict) -> SpecCommandKind:
-    if "Async" in d:
-        return SpecCommandKind.ASYNC
-    elif "Sync" in d:
-        return SpecCommandKind.SYNC
-    else:
-        return SpecCommandKind.GUARDED
-
-
-def translate_severity(d: dict) -> SpecEventSeverity:
-    if "ActivityHigh" in d:
-        return SpecEventSeverity.ACTIVITY_HIGH
-    elif "ActivityLow" in d:
-        return SpecEventSeverity.ACTIVITY_LOW
-    elif "Command" in d:
-        return SpecEventSeverity.COMMAND
-    elif "Diagnostic" in d:
-        return SpecEventSeverity.DIAGNOSTIC
-    elif "Fatal" in d:
-        return SpecEventSeverity.FATAL
-    elif "WarningHigh" in d:
-        return SpecEventSeverity.WARNING_HIGH
-    else:
-        return SpecEventSeverity.WARNING_LOW
+translate_spec_command_kind: Callable[[dict], SpecCommandKind] = kind_translator(
+    SpecCommandKind
+)
+translate_severity: Callable[[dict], SpecEventSeverity] = kind_translator(
+    SpecEventSeverity
+)
 
 def translate_def_abs_type(data: dict, id: AstId) -> AstNode[DefAbsType]:
-    return AstNode.create_with_id(DefAbsType(data["name"]), id)
+    return create_with_id(DefAbsType(ident(data["name"])), id)
 
 def translate_def_alias_type(data: dict, id: AstId) -> AstNode[DefAliasType]:
-    return AstNode.create_with_id(
-        DefAliasType(data["name"], translate_type_name(data["typeName"])),
+    return create_with_id(
+        DefAliasType(ident(data["name"]), translate_type_name(data["typeName"])),
         id,
     )
 
 def translate_def_array(data: dict, id: AstId) -> AstNode[DefArray]:
-    return AstNode.create_with_id(
+    return create_with_id(
         DefArray(
-            data["name"],
+            ident(data["name"]),
             translate_expr(data["size"]),
             translate_type_name(data["eltType"]),
             translate_optional(data["default"], translate_expr),
@@ -258,8 +289,8 @@ def translate_def_array(data: dict, id: AstId) -> AstNode[DefArray]:
     )
 
 def translate_def_constant(data: dict, id: AstId) -> AstNode[DefConstant]:
-    return AstNode.create_with_id(
-        DefConstant(data["name"], translate_expr(data["value"])),
+    return create_with_id(
+        DefConstant(ident(data["name"]), translate_expr(data["value"])),
         id
     )
 
@@ -268,17 +299,18 @@ def translate_def_enum(data: dict, id: AstId) -> AstNode[DefEnum]:
     for c in data["constants"]:
         const = c[1]
         const_data, const_id = read_ast_node(const)
-        node = AstNode.create_with_id(
+        node = create_with_id(
             DefEnumConstant(
-                const_data["name"],
+                ident(const_data["name"]),
                 translate_optional(const_data["value"], translate_expr),
             ),
             const_id,
         )
-        constants.append(annotate(c[0], node, c[2]))
-    return AstNode.create_with_id(
+        Annotations.put(const_id, c[0], c[2])
+        constants.append(node)
+    return create_with_id(
         DefEnum(
-            data["name"],
+            ident(data["name"]),
             translate_optional(data["typeName"], translate_type_name),
             constants,
         ),
@@ -289,229 +321,237 @@ def translate_def_struct(data: dict, id: AstId) -> AstNode[DefStruct]:
     struct_members = []
     for m in data["members"]:
         member_data, member_id = read_ast_node(m[1])
-        node = AstNode.create_with_id(
+        node = create_with_id(
             StructTypeMember(
-                member_data["name"],
+                ident(member_data["name"]),
                 translate_optional(member_data["size"], translate_expr),
                 translate_type_name(member_data["typeName"]),
                 translate_optional(member_data["format"], translate_string),
             ),
             member_id,
         )
-        struct_members.append(annotate(m[0], node, m[2]))
-    return AstNode.create_with_id(
+        Annotations.put(member_id, m[0], m[2])
+        struct_members.append(node)
+    return create_with_id(
         DefStruct(
-            data["name"],
+            ident(data["name"]),
             struct_members,
             translate_optional(data["default"], translate_expr),
         ),
         id,
     )
 
+def translate_spec_command(data: dict, id: AstId) -> AstNode[SpecCommand]:
+    return create_with_id(
+        SpecCommand(
+            translate_spec_command_kind(data["kind"]),
+            ident(data["name"]),
+            translate_formal_params(data["params"]),
+            translate_optional(data["opcode"], translate_expr),
+            translate_optional(data["priority"], translate_expr),
+            translate_optional(data["queueFull"], translate_queue_full_node),
+        ),
+        id,
+    )
+
+def translate_spec_tlm_channel(data: dict, id: AstId) -> AstNode[SpecTlmChannel]:
+    return create_with_id(
+        SpecTlmChannel(
+            ident(data["name"]),
+            translate_type_name(data["typeName"]),
+            translate_optional(data["id"], translate_expr),
+            translate_optional(data["update"], translate_spec_tlm_channel_update),
+            translate_optional(data["format"], translate_string),
+            translate_limits(data["low"]),
+            translate_limits(data["high"]),
+        ),
+        id,
+    )
+
+def translate_spec_event(data: dict, id: AstId) -> AstNode[SpecEvent]:
+    return create_with_id(
+        SpecEvent(
+            ident(data["name"]),
+            translate_formal_params(data["params"]),
+            translate_severity(data["severity"]),
+        ),
+        id,
+    )
+
+def translate_spec_record(data: dict, id: AstId) -> AstNode[SpecRecord]:
+    return create_with_id(
+        SpecRecord(
+            ident(data["name"]),
+            translate_type_name(data["recordType"]),
+            data["isArray"],
+            translate_optional(data["id"], translate_expr),
+        ),
+        id,
+    )
+
+def translate_spec_container(data: dict, id: AstId) -> AstNode[SpecContainer]:
+    return create_with_id(
+        SpecContainer(
+            ident(data["name"]),
+            translate_optional(data["id"], translate_expr),
+            translate_optional(data["defaultPriority"], translate_expr),
+        ),
+        id,
+    )
+
+def translate_spec_param(data: dict, id: AstId) -> AstNode[SpecParam]:
+    return create_with_id(
+        SpecParam(
+            ident(data["name"]),
+            translate_type_name(data["typeName"]),
+            translate_optional(data["default"], translate_expr),
+            translate_optional(data["id"], translate_expr),
+            translate_optional(data["setOpcode"], translate_expr),
+            translate_optional(data["saveOpcode"], translate_expr),
+            data["isExternal"],
+        ),
+        id,
+    )
+
+def translate_spec_port_matching(data: dict, id: AstId) -> AstNode[SpecPortMatching]:
+    return create_with_id(
+        SpecPortMatching(
+            translate_ident(data["port1"]),
+            translate_ident(data["port2"]),
+        ),
+        id,
+    )
+
+def translate_spec_internal_port(data: dict, id: AstId) -> AstNode[SpecInternalPort]:
+    return create_with_id(
+        SpecInternalPort(
+            ident(data["name"]),
+            translate_formal_params(data["params"]),
+            translate_optional(data["priority"], translate_expr),
+            translate_optional(data["queueFull"], translate_queue_full),
+        ),
+        id,
+    )
+
+def translate_spec_port_instance(data: dict, id: AstId) -> AstNode[SpecPortInstance]:
+    return create_with_id(translate_port_instance(data), id)
+
+def translate_spec_import(data: dict, id: AstId) -> AstNode[SpecImport]:
+    return create_with_id(SpecImport(translate_qual_ident(data["sym"])), id)
+
+MemberTranslators: TypeAlias = Dict[
+    str, Tuple[Callable[[AstNode], Any], Callable[[dict, AstId], AstNode]]
+]
+"""Member wrapper class and node translator, keyed by member kind"""
+
+_COMPONENT_MEMBERS: MemberTranslators = {
+    "DefAbsType": (ComponentMemberDefAbsType, translate_def_abs_type),
+    "DefAliasType": (ComponentMemberDefAliasType, translate_def_alias_type),
+    "DefArray": (ComponentMemberDefArray, translate_def_array),
+    "DefConstant": (ComponentMemberDefConstant, translate_def_constant),
+    "DefEnum": (ComponentMemberDefEnum, translate_def_enum),
+    "SpecCommand": (ComponentMemberSpecCommand, translate_spec_command),
+    "DefStruct": (ComponentMemberDefStruct, translate_def_struct),
+    "SpecTlmChannel": (ComponentMemberSpecTlmChannel, translate_spec_tlm_channel),
+    "SpecEvent": (ComponentMemberSpecEvent, translate_spec_event),
+    "SpecRecord": (ComponentMemberSpecRecord, translate_spec_record),
+    "SpecContainer": (ComponentMemberSpecContainer, translate_spec_container),
+    "SpecParam": (ComponentMemberSpecParam, translate_spec_param),
+    "SpecPortMatching": (ComponentMemberSpecPortMatching, translate_spec_port_matching),
+    "SpecInternalPort": (ComponentMemberSpecInternalPort, translate_spec_internal_port),
+    "SpecPortInstance": (ComponentMemberSpecPortInstance, translate_spec_port_instance),
+    "SpecImportInterface": (ComponentMemberSpecImportInterface, translate_spec_import),
+}
+
 def translate_component_members(l: list) -> List[ComponentMember]:
     members = []
     for m in l:
-        m_key = list(m[1].keys())[0]
-        member = None
-        node = m[1][m_key]
-        data, id = read_ast_node(node["node"])
-        match m_key:
-            case "DefAbsType":
-                member = ComponentMemberDefAbsType(translate_def_abs_type(data, id))
-            case "DefAliasType":
-                member = ComponentMemberDefAliasType(translate_def_alias_type(data, id))
-            case "DefArray":
-                member = ComponentMemberDefArray(translate_def_array(data, id))
-            case "DefConstant":
-                member = ComponentMemberDefConstant(translate_def_constant(data, id))
-            case "DefEnum":
-                member = ComponentMemberDefEnum(translate_def_enum(data, id))
-            case "SpecCommand":
-                member = ComponentMemberSpecCommand(
-                    AstNode.create_with_id(
-                        SpecCommand(
-                            translate_spec_command_kind(data["kind"]),
-                            data["name"],
-                            translate_formal_params(data["params"]),
-                            translate_optional(data["opcode"], translate_expr),
-                            translate_optional(data["priority"], translate_expr),
-                            translate_optional(data["queueFull"], translate_queue_full),
-                        ),
-                        id,
-                    )
-                )
-            case "DefStruct":
-                member = ComponentMemberDefStruct(translate_def_struct(data, id))
-            case "SpecTlmChannel":
-                member = ComponentMemberSpecTlmChannel(
-                    AstNode.create_with_id(
-                        SpecTlmChannel(
-                            data["name"],
-                            translate_type_name(data["typeName"]),
-                            translate_optional(data["id"], translate_expr),
-                            translate_optional(
-                                data["update"], translate_spec_tlm_channel_update
-                            ),
-                            translate_optional(data["format"], translate_string),
-                            translate_limits(data["low"]),
-                            translate_limits(data["high"]),
-                        ),
-                        id,
-                    )
-                )
-            case "SpecEvent":
-                member = ComponentMemberSpecEvent(
-                    AstNode.create_with_id(
-                        SpecEvent(
-                            data["name"],
-                            translate_formal_params(data["params"]),
-                            translate_severity(data["severity"]),
-                        ),
-                        id,
-                    )
-                )
-            case "SpecRecord":
-                member = ComponentMemberSpecRecord(
-                    AstNode.create_with_id(
-                        SpecRecord(
-                            data["name"],
-                            translate_type_name(data["recordType"]),
-                            data["isArray"],
-                            translate_optional(data["id"], translate_expr),
-                        ),
-                        id,
-                    )
-                )
-            case "SpecContainer":
-                member = ComponentMemberSpecContainer(
-                    AstNode.create_with_id(
-                        SpecContainer(
-                            data["name"],
-                            translate_optional(data["id"], translate_expr),
-                            translate_optional(data["defaultPriority"], translate_expr),
-                        ),
-                        id,
-                    )
-                )
-            case "SpecParam":
-                member = ComponentMemberSpecParam(
-                    AstNode.create_with_id(
-                        SpecParam(
-                            data["name"],
-                            translate_type_name(data["typeName"]),
-                            translate_optional(data["default"], translate_expr),
-                            translate_optional(data["id"], translate_expr),
-                            translate_optional(data["setOpcode"], translate_expr),
-                            translate_optional(data["saveOpcode"], translate_expr),
-                            data["isExternal"],
-                        ),
-                        id,
-                    )
-                )
-            case "SpecPortMatching":
-                member = ComponentMemberSpecPortMatching(
-                    AstNode.create_with_id(
-                        SpecPortMatching(
-                            translate_ident(data["port1"]),
-                            translate_ident(data["port2"]),
-                        ),
-                        id,
-                    )
-                )
-            case "SpecInternalPort":
-                member = ComponentMemberSpecInternalPort(
-                    AstNode.create_with_id(
-                        SpecInternalPort(
-                            data["name"],
-                            translate_formal_params(data["params"]),
-                            translate_optional(data["priority"], translate_expr),
-                            translate_optional(data["queueFull"], translate_queue_full),
-                        ),
-                        id,
-                    )
-                )
-            case "SpecPortInstance":
-                member = ComponentMemberSpecPortInstance(
-                    AstNode.create_with_id(translate_port_instance(node["node"]), id)
-                )
-            case "SpecImportInterface":
-                member = ComponentMemberSpecImportInterface(
-                    AstNode.create_with_id(
-                        SpecImport(translate_qual_ident(data["sym"])), id
-                    )
-                )
-            case _:
-                raise InvalidFppToJsonField(m_key)
-        members.append(annotate(m[0], member, m[2]))
+        m_dict: dict = m[1]
+        m_key = next(iter(m_dict))
+        entry = _COMPONENT_MEMBERS.get(m_key)
+        if entry is None:
+            raise InvalidFppToJsonField(m_key)
+        wrap, translate = entry
+        data, id = read_ast_node(m_dict[m_key]["node"])
+        member = wrap(translate(data, id))
+        Annotations.put(id, m[0], m[2])
+        members.append(member)
     return members
 
 
+def translate_def_choice(data: dict, id: AstId) -> AstNode[DefChoice]:
+    return create_with_id(
+        DefChoice(
+            ident(data["name"]),
+            translate_ident(data["guard"]),
+            translate_transition_expr(data["ifTransition"]),
+            translate_transition_expr(data["elseTransition"]),
+        ),
+        id,
+    )
+
+def translate_def_state(data: dict, id: AstId) -> AstNode[DefState]:
+    return create_with_id(
+        DefState(ident(data["name"]), translate_state_members(data["members"])), id
+    )
+
+def translate_spec_state_entry(data: dict, id: AstId) -> AstNode[SpecStateEntry]:
+    return create_with_id(
+        SpecStateEntry(translate_actions(data["actions"])), id
+    )
+
+def translate_spec_state_exit(data: dict, id: AstId) -> AstNode[SpecStateExit]:
+    return create_with_id(
+        SpecStateExit(translate_actions(data["actions"])), id
+    )
+
+def translate_spec_initial_transition(
+    data: dict, id: AstId
+) -> AstNode[SpecInitialTransition]:
+    return create_with_id(
+        SpecInitialTransition(translate_transition_expr(data["transition"])), id
+    )
+
+def translate_spec_state_transition(
+    data: dict, id: AstId
+) -> AstNode[SpecStateTransition]:
+    signal = translate_ident(data["signal"])
+    transition_or_do = translate_transition_or_do(data["transitionOrDo"])
+    return create_with_id(
+        SpecStateTransition(
+            signal,
+            translate_optional(data["guard"], translate_ident),
+            transition_or_do,
+        ),
+        id,
+    )
+
+_STATE_MEMBERS: MemberTranslators = {
+    "DefChoice": (StateMemberDefChoice, translate_def_choice),
+    "DefState": (StateMemberDefState, translate_def_state),
+    "SpecStateEntry": (StateMemberSpecStateEntry, translate_spec_state_entry),
+    "SpecStateExit": (StateMemberSpecStateExit, translate_spec_state_exit),
+    "SpecInitialTransition": (
+        StateMemberSpecInitialTransition, translate_spec_initial_transition
+    ),
+    "SpecStateTransition": (
+        StateMemberSpecStateTransition, translate_spec_state_transition
+    ),
+}
+
 def translate_state_members(l: List) -> List[StateMember]:
     members = []
     for m in l:
         m_dict: dict = m[1]
-        m_key = list(m_dict.keys())[0]
+        m_key = next(iter(m_dict))
+        entry = _STATE_MEMBERS.get(m_key)
+        if entry is None:
+            raise InvalidFppToJsonField(m_key)
+        wrap, translate = entry
         data, id = read_ast_node(m_dict[m_key]["node"])
-        member = None
-        match m_key:
-            case "DefChoice":
-                member = StateMemberDefChoice(
-                    AstNode.create_with_id(
-                        DefChoice(
-                            data["name"],
-                            translate_ident(data["guard"]),
-                            translate_transition_expr(data["ifTransition"]),
-                            translate_transition_expr(data["elseTransition"]),
-                        ),
-                        id,
-                    )
-                )
-            case "DefState":
-                member = StateMemberDefState(
-                    AstNode.create_with_id(
-                        DefState(
-                            data["name"], translate_state_members(data["members"])
-                        ),
-                        id,
-                    )
-                )
-            case "SpecStateEntry":
-                member = StateMemberSpecStateEntry(
-                    AstNode.create_with_id(
-                        SpecStateEntry(translate_actions(data["actions"])), id
-                    )
-                )
-            case "SpecStateExit":
-                member = StateMemberSpecStateExit(
-                    AstNode.create_with_id(
-                        SpecStateExit(translate_actions(data["actions"])), id
-                    )
-                )
-            case "SpecInitialTransition":
-                member = StateMemberSpecInitialTransition(
-                    AstNode.create_with_id(
-                        SpecInitialTransition(
-                            translate_transition_expr(data["transition"])
-                        ),
-                        id,
-                    )
-                )
-            case "SpecStateTransition":
-                signal = translate_ident(data["signal"])
-                transition_or_do = translate_transition_or_do(data["transitionOrDo"])
-                member = StateMemberSpecStateTransition(
-                    AstNode.create_with_id(
-                        SpecStateTransition(
-                            signal,
-                            translate_optional(data["guard"], translate_ident),
-                            transition_or_do,
-                        ),
-                        id,
-                    )
-                )
-            case _:
-                raise InvalidFppToJsonField(m_key)
-        members.append(annotate(m[0], member, m[2]))
+        member = wrap(translate(data, id))
+        Annotations.put(id, m[0], m[2])
+        members.append(member)
     return members
 
 
@@ -523,30 +563,12 @@ def translate_port_instance_identifier(d: dict) -> PortInstanceIdentifier:
     )
 
 
-def translate_pattern_kind(d: dict) -> PatternKind:
-    kind = list(d.keys())[0]
-    match kind:
-        case "Command":
-            return PatternKind.COMMAND
-        case "Event":
-            return PatternKind.EVENT
-        case "Health":
-            return PatternKind.HEALTH
-        case "Param":
-            return PatternKind.PARAM
-        case "Telemetry":
-            return PatternKind.TELEMETRY
-        case "TextEvent":
-            return PatternKind.TEXT_EVENT
-        case "Time":
-            return PatternKind.TIME
-        case _:
-            raise InvalidFppToJsonField(kind)
+translate_pattern_kind: Callable[[dict], PatternKind] = kind_translator(PatternKind)
 
 
 def translate_tlm_channel_identifier(d: dict) -> AstNode[TlmChannelIdentifier]:
     data, id = read_ast_node(d)
-    return AstNode.create_with_id(
+    return create_with_id(
         TlmChannelIdentifier(
             translate_qual_ident(data["componentInstance"]),
             translate_ident(data["channelName"]),
@@ -555,480 +577,432 @@ def translate_tlm_channel_identifier(d: dict) -> AstNode[TlmChannelIdentifier]:
     )
 
 
-def translate_special_input_kind(d: dict) -> SpecialInputKind:
-    if "Async" in d:
-        return SpecialInputKind.ASYNC
-    elif "Sync" in d:
-        return SpecialInputKind.SYNC
-    elif "Guarded" in d:
-        return SpecialInputKind.GUARDED
-    else:
-        raise Exception(f"Invalid special input kind dictionary {d}")
-
-
-def translate_special_kind(d: dict) -> SpecialKind:
-    if "CommandRecv" in d:
-        return SpecialKind.COMMAND_RECV
-    elif "CommandReg" in d:
-        return SpecialKind.COMMAND_REG
-    elif "CommandResp" in d:
-        return SpecialKind.COMMAND_RESP
-    elif "Event" in d:
-        return SpecialKind.EVENT
-    elif "ParamGet" in d:
-        return SpecialKind.PARAM_GET
-    elif "ParamSet" in d:
-        return SpecialKind.PARAM_SET
-    elif "ProductGet" in d:
-        return SpecialKind.PRODUCT_GET
-    elif "ProductRecv" in d:
-        return SpecialKind.PRODUCT_RECV
-    elif "ProductRequest" in d:
-        return SpecialKind.PRODUCT_REQUEST
-    elif "ProductSend" in d:
-        return SpecialKind.PRODUCT_SEND
-    elif "Telemetry" in d:
-        return SpecialKind.TELEMETRY
-    elif "TextEvent" in d:
-        return SpecialKind.TEXT_EVENT
-    elif "TimeGet" in d:
-        return SpecialKind.TIME_GET
-    else:
-        raise Exception(f"Invalid special kind dictionary {d}")
-
-
-def translate_general_kind(d: dict) -> GeneralKind:
-    if "AsyncInput" in d:
-        return GeneralKind.ASYNC_INPUT
-    elif "GuardedInput" in d:
-        return GeneralKind.GUARDED_INPUT
-    elif "Output" in d:
-        return GeneralKind.OUTPUT
-    elif "SyncInput" in d:
-        return GeneralKind.SYNC_INPUT
-    else:
-        raise Exception(f"Invalid general kind dictionary {d}")
+translate_special_input_kind: Callable[[dict], SpecialInputKind] = kind_translator(
+    SpecialInputKind
+)
+translate_special_kind: Callable[[dict], SpecialKind] = kind_translator(SpecialKind)
+translate_general_kind: Callable[[dict], GeneralKind] = kind_translator(GeneralKind)
 
 
-def translate_optional(d: dict, func: Callable[[Any], T]) -> Optional[T]:
-    if "Some" in d:
+def translate_optional(d: Any, func: Callable[[Any], T]) -> Optional[T]:
+    # Same test as read_optional, inlined since this runs for every optional field
+    if d.__class__ is dict and "Some" in d:
         return func(d["Some"])
-    else:
-        return None
+    return None
 
 
-def translate_queue_full(d: dict) -> QueueFull:
-    if "Assert" in d:
-        return QueueFull.ASSERT
-    elif "Block" in d:
-        return QueueFull.BLOCK
-    elif "Drop" in d:
-        return QueueFull.DROP
-    else:
-        return QueueFull.HOOK
+translate_queue_full: Callable[[dict], QueueFull] = kind_translator(QueueFull)
 
 
-def translate_port_instance(d: dict) -> SpecPortInstance:
-    if "Special" in d["AstNode"]["data"]:
-        special_node = d["AstNode"]["data"]["Special"]
+def translate_queue_full_node(d: dict) -> AstNode[QueueFull]:
+    data, id = read_ast_node(d)
+    return create_with_id(translate_queue_full(data), id)
+
+
+def translate_port_instance(data: dict) -> SpecPortInstance:
+    if "Special" in data:
+        special_node = data["Special"]
         return Special(
             translate_optional(special_node["inputKind"], translate_special_input_kind),
             translate_special_kind(special_node["kind"]),
-            special_node["name"],
+            ident(special_node["name"]),
             translate_optional(special_node["priority"], translate_expr),
-            translate_optional(special_node["queueFull"], translate_queue_full),
+            translate_optional(special_node["queueFull"], translate_queue_full_node),
         )
-    elif "General" in d["AstNode"]["data"]:
-        general_node = d["AstNode"]["data"]["General"]
+    elif "General" in data:
+        general_node = data["General"]
         return General(
             translate_general_kind(general_node["kind"]),
-            general_node["name"],
+            ident(general_node["name"]),
             translate_optional(general_node["size"], translate_expr),
             translate_optional(general_node["port"], translate_qual_ident),
             translate_optional(general_node["priority"], translate_expr),
-            translate_optional(general_node["queueFull"], translate_queue_full),
+            translate_optional(general_node["queueFull"], translate_queue_full_node),
         )
     else:
-        raise Exception(f"Invalid port instance dictionary {d}")
+        raise Exception(f"Invalid port instance dictionary {data}")
 
 
-def translate_init_specs(l: list) -> List[Annotated[AstNode[SpecInit]]]:
+def translate_init_specs(l: list) -> List[AstNode[SpecInit]]:
     specs = []
     for e in l:
-        spec_node = e[1]
-        data = spec_node["AstNode"]["data"]
-        id = spec_node["AstNode"]["id"]
-        spec = AstNode.create_with_id(
+        data, id = read_ast_node(e[1])
+        spec = create_with_id(
             SpecInit(translate_expr(data["phase"]), data["code"]), id
         )
-        specs.append(annotate(e[0], spec, e[2]))
+        Annotations.put(id, e[0], e[2])
+        specs.append(spec)
     return specs
 
 
+_INTERFACE_MEMBERS: MemberTranslators = {
+    "SpecPortInstance": (InterfaceMemberSpecPortInstance, translate_spec_port_instance),
+    "SpecImportInterface": (InterfaceMemberSpecImportInterface, translate_spec_import),
+}
+
 def translate_interface_members(l: List) -> List[InterfaceMember]:
     members = []
     for m in l:
-        m_dict: dict = m["node"][1]
-        m_key = list(m_dict.keys())[0]
-        id = m_dict[m_key]["node"]["AstNode"]["id"]
-        data: dict = m_dict[m_key]["node"]["AstNode"]["data"]
-        member = None
-        match m_key:
-            case "SpecPortInstance":
-                member = InterfaceMemberSpecPortInstance(
-                    AstNode.create_with_id(
-                        translate_port_instance(m_dict[m_key]["node"]), id
-                    )
-                )
-            case "SpecImportInterface":
-                member = InterfaceMemberSpecImportInterface(
-                    AstNode.create_with_id(
-                        SpecImport(translate_qual_ident(data["sym"])), id
-                    )
-                )
-            case _:
-                raise InvalidFppToJsonField(m_key)
-        members.append(annotate(m["node"][0], member, m["node"][2]))
+        pre, m_dict, post = m["node"]
+        m_key = next(iter(m_dict))
+        entry = _INTERFACE_MEMBERS.get(m_key)
+        if entry is None:
+            raise InvalidFppToJsonField(m_key)
+        wrap, translate = entry
+        data, id = read_ast_node(m_dict[m_key]["node"])
+        member = wrap(translate(data, id))
+        Annotations.put(id, pre, post)
+        members.append(member)
     return members
 
 
 def translate_tlm_packet_set_members(d: dict) -> List[TlmPacketSetMember]:
     members = []
     for member in d:
-        node = member["node"][1]
+        pre, node, post = member["node"]
         if "SpecTlmPacket" in node:
             spec_tlm_pkt_data, spec_tlm_pkt_id = read_ast_node(
                 node["SpecTlmPacket"]["node"]
             )
-            tlm_pkt_members = []
-            for m in spec_tlm_pkt_data["members"]:
-                if "TlmChannelIdentifier" in m:
-                    chan_ident_node = m["TlmChannelIdentifier"]["node"]
-                    tlm_pkt_members.append(
-                        TlmPacketMemberTlmChannelIdentifier(
-                            AstNode.create_with_id(
-                                translate_tlm_channel_identifier(chan_ident_node),
-                                chan_ident_node["AstNode"]["id"],
-                            )
-                        )
-                    )
+            tlm_pkt_members = [
+                TlmPacketMemberTlmChannelIdentifier(
+                    translate_tlm_channel_identifier(m["TlmChannelIdentifier"]["node"])
+                )
+                for m in spec_tlm_pkt_data["members"]
+                if "TlmChannelIdentifier" in m
+            ]
             pkt = TlmPacketSetMemberSpecTlmPacket(
-                AstNode.create_with_id(
+                create_with_id(
                     SpecTlmPacket(
-                        spec_tlm_pkt_data["name"],
+                        ident(spec_tlm_pkt_data["name"]),
                         translate_optional(spec_tlm_pkt_data["id"], translate_expr),
-                        spec_tlm_pkt_data["group"],
+                        translate_expr(spec_tlm_pkt_data["group"]),
                         tlm_pkt_members,
                     ),
                     spec_tlm_pkt_id,
                 )
             )
-            members.append(annotate(member["node"][0], pkt, member["node"][2]))
+            Annotations.put(spec_tlm_pkt_id, pre, post)
+            members.append(pkt)
         elif "SpecInclude" in node:
             raise NotSupportedInFppToJsonException("SpecInclude")
+    return members
+
+
+def translate_spec_comp_instance(data: dict, id: AstId) -> AstNode[SpecCompInstance]:
+    visibility = Visibility.PRIVATE
+    if "Public" in data["visibility"]:
+        visibility = Visibility.PUBLIC
+    return create_with_id(
+        SpecCompInstance(visibility, translate_qual_ident(data["instance"])), id
+    )
+
+def translate_spec_connection_graph(
+    data: dict, id: AstId
+) -> AstNode[SpecConnectionGraph]:
+    if "Direct" in data:
+        direct = data["Direct"]
+        connections = []
+        for c in direct["connections"]:
+            connections.append(
+                Connection(
+                    c["isUnmatched"],
+                    translate_port_instance_identifier(c["fromPort"]),
+                    translate_optional(c["fromIndex"], translate_expr),
+                    translate_port_instance_identifier(c["toPort"]),
+                    translate_optional(c["toIndex"], translate_expr),
+                )
+            )
+        connection_graph = Direct(ident(direct["name"]), connections)
+    elif "Pattern" in data:
+        pattern = data["Pattern"]
+        targets = [translate_qual_ident(t) for t in pattern["targets"]]
+        connection_graph = Pattern(
+            translate_pattern_kind(pattern["kind"]),
+            translate_qual_ident(pattern["source"]),
+            targets,
+        )
+    else:
+        raise Exception(f"Invalid SpecConnectionGraph dictionary {data}")
+    return create_with_id(connection_graph, id)
+
+def translate_spec_tlm_packet_set(data: dict, id: AstId) -> AstNode[SpecTlmPacketSet]:
+    omitted = [translate_tlm_channel_identifier(o) for o in data["omitted"]]
+    return create_with_id(
+        SpecTlmPacketSet(
+            ident(data["name"]),
+            translate_tlm_packet_set_members(data["members"]),
+            omitted,
+        ),
+        id,
+    )
 
+_TOPOLOGY_MEMBERS: MemberTranslators = {
+    "SpecCompInstance": (TopologyMemberSpecCompInstance, translate_spec_comp_instance),
+    "SpecConnectionGraph": (
+        TopologyMemberSpecConnectionGraph, translate_spec_connection_graph
+    ),
+    "SpecTlmPacketSet": (TopologyMemberSpecTlmPacketSet, translate_spec_tlm_packet_set),
+    "SpecTopImport": (TopologyMemberSpecTopImport, translate_spec_import),
+}
 
 def translate_topology_members(l: List) -> List[TopologyMember]:
     members = []
     for m in l:
         m_dict: dict = m[1]
-        m_key = list(m_dict.keys())[0]
-        id = m_dict[m_key]["node"]["AstNode"]["id"]
-        data: dict = m_dict[m_key]["node"]["AstNode"]["data"]
-        member = None
-        match m_key:
-            case "SpecCompInstance":
-                visibility = Visibility.PRIVATE
-                if "Public" in data["visibility"]:
-                    visibility = Visibility.PUBLIC
-                member = TopologyMemberSpecCompInstance(
-                    AstNode.create_with_id(
-                        SpecCompInstance(
-                            visibility, translate_qual_ident(data["instance"])
-                        ),
-                        id,
-                    )
-                )
-            case "SpecConnectionGraph":
-                if "Direct" in data:
-                    connections = []
-                    for c in data["Direct"]["connections"]:
-                        from_index = None
-                        if c["fromIndex"] != "None":
-                            from_index = translate_expr(c["fromIndex"]["Some"])
-                        to_index = None
-                        if c["toIndex"] != "None":
-                            to_index = translate_expr(c["toIndex"]["Some"])
-                        connections.append(
-                            Connection(
-                                c["isUnmatched"],
-                                translate_port_instance_identifier(c["fromPort"]),
-                                from_index,
-                                translate_port_instance_identifier(c["toPort"]),
-                                to_index,
-                            )
-                        )
-                    connection_graph = Direct(data["Direct"]["name"], connections)
-                elif "Pattern" in data:
-                    targets = []
-                    for t in data["Pattern"]["targets"]:
-                        targets.append(translate_qual_ident(t))
-                    connection_graph = Pattern(
-                        translate_pattern_kind(data["Pattern"]["kind"]),
-                        translate_qual_ident(data["Pattern"]["source"]),
-                        targets,
-                    )
-                else:
-                    raise Exception(f"Invalid SpecConnectionGraph dictionary {data}")
-
-                member = TopologyMemberSpecConnectionGraph(
-                    AstNode.create_with_id(connection_graph, id)
-                )
-            case "SpecInclude":
-                raise Exception("SpecInclude translation not implemented")
-            case "SpecTlmPacketSet":
-                omitted = []
-                for o in data["omitted"]:
-                    omitted.append(translate_tlm_channel_identifier(o))
-                member = TopologyMemberSpecTlmPacketSet(
-                    AstNode.create_with_id(
-                        SpecTlmPacketSet(
-                            data["name"],
-                            translate_tlm_packet_set_members(data["members"]),
-                            omitted,
-                        ),
-                        id,
-                    )
-                )
-            case "SpecTopImport":
-                member = TopologyMemberSpecTopImport(
-                    AstNode.create_with_id(
-                        SpecImport(translate_qual_ident(data["sym"])), id
-                    )
-                )
-            case _:
-                raise InvalidFppToJsonField(m_key)
+        m_key = next(iter(m_dict))
+        entry = _TOPOLOGY_MEMBERS.get(m_key)
+        if entry is None:
+            if m_key == "SpecInclude":
+                raise NotSupportedInFppToJsonException(m_key)
+            raise InvalidFppToJsonField(m_key)
+        wrap, translate = entry
+        data, id = read_ast_node(m_dict[m_key]["node"])
+        member = wrap(translate(data, id))
+        Annotations.put(id, m[0], m[2])
         members.append(member)
     return members
 
 
+translate_component_kind: Callable[[dict], ComponentKind] = kind_translator(
+    ComponentKind
+)
+
+def translate_def_component(data: dict, id: AstId) -> AstNode[DefComponent]:
+    return create_with_id(
+        DefComponent(
+            translate_component_kind(data["kind"]),
+            ident(data["name"]),
+            translate_component_members(data["members"]),
+        ),
+        id,
+    )
+
+def translate_def_component_instance(
+    data: dict, id: AstId
+) -> AstNode[DefComponentInstance]:
+    return create_with_id(
+        DefComponentInstance(
+            ident(data["name"]),
+            translate_qual_ident(data["component"]),
+            translate_expr(data["baseId"]),
+            translate_optional(data["implType"], translate_string),
+            translate_optional(data["file"], translate_string),
+            translate_optional(data["queueSize"], translate_expr),
+            translate_optional(data["stackSize"], translate_expr),
+            translate_optional(data["priority"], translate_expr),
+            translate_optional(data["cpu"], translate_expr),
+            translate_init_specs(data["initSpecs"]),
+        ),
+        id,
+    )
+
+def translate_def_interface(data: dict, id: AstId) -> AstNode[DefInterface]:
+    return create_with_id(
+        DefInterface(
+            ident(data["name"]), translate_interface_members(data["members"])
+        ),
+        id,
+    )
+
+def translate_def_module(data: dict, id: AstId) -> AstNode[DefModule]:
+    return create_with_id(
+        DefModule(ident(data["name"]), translate_module_members(data["members"])), id
+    )
+
+def translate_def_port(data: dict, id: AstId) -> AstNode[DefPort]:
+    params = translate_formal_params(data["params"])
+    return create_with_id(
+        DefPort(
+            ident(data["name"]),
+            params,
+            translate_optional(data["returnType"], translate_type_name),
+        ),
+        id,
+    )
+
+def translate_def_state_machine(data: dict, id: AstId) -> AstNode[DefStateMachine]:
+    return create_with_id(
+        DefStateMachine(
+            ident(data["name"]), translate_state_machine_members(data["members"])
+        ),
+        id,
+    )
+
+def translate_def_topology(data: dict, id: AstId) -> AstNode[DefTopology]:
+    return create_with_id(
+        DefTopology(
+            ident(data["name"]), translate_topology_members(data["members"])
+        ),
+        id,
+    )
+
+_MODULE_MEMBERS: MemberTranslators = {
+    "DefAbsType": (ModuleMemberDefAbsType, translate_def_abs_type),
+    "DefAliasType": (ModuleMemberDefAliasType, translate_def_alias_type),
+    "DefArray": (ModuleMemberDefArray, translate_def_array),
+    "DefComponent": (ModuleMemberDefComponent, translate_def_component),
+    "DefComponentInstance": (
+        ModuleMemberDefComponentInstance, translate_def_component_instance
+    ),
+    "DefConstant": (ModuleMemberDefConstant, translate_def_constant),
+    "DefEnum": (ModuleMemberDefEnum, translate_def_enum),
+    "DefInterface": (ModuleMemberDefInterface, translate_def_interface),
+    "DefModule": (ModuleMemberDefModule, translate_def_module),
+    "DefPort": (ModuleMemberDefPort, translate_def_port),
+    "DefStateMachine": (ModuleMemberDefStateMachine, translate_def_state_machine),
+    "DefStruct": (ModuleMemberDefStruct, translate_def_struct),
+    "DefTopology": (ModuleMemberDefTopology, translate_def_topology),
+}
+
 def translate_module_members(l: List) -> List[ModuleMember]:
     members = []
-    for m in l:
-        for k, v in m[1].items():
-            data, id = read_ast_node(v["node"])
-            name = data["name"]
-            member = None
-            match k:
-                case "DefAbsType":
-                    member = ModuleMemberDefAbsType(translate_def_abs_type(data, id))
-                case "DefAliasType":
-                    member = ModuleMemberDefAliasType(translate_def_alias_type(data, id))
-                case "DefArray":
-                    member = ModuleMemberDefArray(translate_def_array(data, id))
-                case "DefComponent":
-                    if "Active" in data["kind"]:
-                        kind = ComponentKind.ACTIVE
-                    elif "Passive" in data["kind"]:
-                        kind = ComponentKind.PASSIVE
-                    elif "Queued" in data["kind"]:
-                        kind = ComponentKind.QUEUED
-                    else:
-                        raise Exception(f"Invalid component kind dictionary {data}")
-                    member = ModuleMemberDefComponent(
-                        AstNode.create_with_id(
-                            DefComponent(
-                                kind,
-                                name,
-                                translate_component_members(data["members"]),
-                            ),
-                            id,
-                        )
-                    )
-                case "DefComponentInstance":
-                    member = ModuleMemberDefComponentInstance(
-                        AstNode.create_with_id(
-                            DefComponentInstance(
-                                name,
-                                translate_qual_ident(data["component"]),
-                                translate_expr(data["baseId"]),
-                                translate_optional(data["implType"], translate_string),
-                                translate_optional(data["file"], translate_string),
-                                translate_optional(data["queueSize"], translate_expr),
-                                translate_optional(data["stackSize"], translate_expr),
-                                translate_optional(data["priority"], translate_expr),
-                                translate_optional(data["cpu"], translate_expr),
-                                translate_init_specs(data["initSpecs"]),
-                            ),
-                            id,
-                        )
-                    )
-                case "DefConstant":
-                    member = ModuleMemberDefConstant(translate_def_constant(data, id))
-                case "DefEnum":
-                    member = ModuleMemberDefEnum(translate_def_enum(data, id))
-                case "DefInterface":
-                    member = ModuleMemberDefInterface(
-                        AstNode.create_with_id(
-                            DefInterface(
-                                name, translate_interface_members(data["members"])
-                            ),
-                            id,
-                        )
-                    )
-                case "DefModule":
-                    member = ModuleMemberDefModule(
-                        AstNode.create_with_id(
-                            DefModule(name, translate_module_members(data["members"])),
-                            id,
-                        )
-                    )
-                case "DefPort":
-                    params = translate_formal_params(data["params"])
-                    member = ModuleMemberDefPort(
-                        AstNode.create_with_id(
-                            DefPort(
-                                name,
-                                params,
-                                translate_optional(
-                                    data["returnType"], translate_type_name
-                                ),
-                            ),
-                            id,
-                        )
-                    )
-                case "DefStateMachine":
-                    member = ModuleMemberDefStateMachine(
-                        AstNode.create_with_id(
-                            DefStateMachine(
-                                name, translate_state_machine_members(data["members"])
-                            ),
-                            id,
-                        )
-                    )
-                case "DefStruct":
-                    member = ModuleMemberDefStruct(translate_def_struct(data, id))
-                case "DefTopology":
-                    member = ModuleMemberDefTopology(
-                        AstNode.create_with_id(
-                            DefTopology(
-                                name, translate_topology_members(data["members"])
-                            ),
-                            id,
-                        )
-                    )
-                case "SpecInclude":
-                    raise NotSupportedInFppToJsonException(k)
-                case "SpecLoc":
-                    raise NotSupportedInFppToJsonException(k)
-                case _:
-                    raise InvalidFppToJsonField(k)
-            members.append(annotate(m[0], member, m[2]))
+    for pre, m_dict, post in l:
+        m_key = next(iter(m_dict))
+        entry = _MODULE_MEMBERS.get(m_key)
+        if entry is None:
+            if m_key == "SpecInclude" or m_key == "SpecLoc":
+                raise NotSupportedInFppToJsonException(m_key)
+            raise InvalidFppToJsonField(m_key)
+        wrap, translate = entry
+        data, id = read_ast_node(m_dict[m_key]["node"])
+        member = wrap(translate(data, id))
+        Annotations.put(id, pre, post)
+        members.append(member)
     return members
 
 
-def translate_state_machine_members(d: Dict[str, List]) -> List[StateMachineMember]:
+def translate_def_action(data: dict, id: AstId) -> AstNode[DefAction]:
+    return create_with_id(
+        DefAction(
+            ident(data["name"]),
+            translate_optional(data["typeName"], translate_type_name),
+        ),
+        id,
+    )
+
+def translate_def_guard(data: dict, id: AstId) -> AstNode[DefGuard]:
+    return create_with_id(
+        DefGuard(
+            ident(data["name"]),
+            translate_optional(data["typeName"], translate_type_name),
+        ),
+        id,
+    )
+
+def translate_def_signal(data: dict, id: AstId) -> AstNode[DefSignal]:
+    return create_with_id(
+        DefSignal(
+            ident(data["name"]),
+            translate_optional(data["typeName"], translate_type_name),
+        ),
+        id,
+    )
+
+_STATE_MACHINE_MEMBERS: MemberTranslators = {
+    "DefAction": (StateMachineMemberDefAction, translate_def_action),
+    "DefChoice": (StateMachineMemberDefChoice, translate_def_choice),
+    "DefGuard": (StateMachineMemberDefGuard, translate_def_guard),
+    "DefSignal": (StateMachineMemberDefSignal, translate_def_signal),
+    "DefState": (StateMachineMemberDefState, translate_def_state),
+    "SpecInitialTransition": (
+        StateMachineMemberDefSpecInitialTransition, translate_spec_initial_transition
+    ),
+}
+
+def translate_state_machine_members(d: Any) -> List[StateMachineMember]:
     members = []
-    if d.get("Some"):
-        for l in d["Some"]:
-            for k, v in l[1].items():
-                data, id = read_ast_node(v["node"])
-                member = None
-                match k:
-                    case "DefAction":
-                        member = StateMachineMemberDefAction(
-                            AstNode.create_with_id(
-                                DefAction(
-                                    data["name"],
-                                    translate_optional(
-                                        data["typeName"], translate_type_name
-                                    ),
-                                ),
-                                id,
-                            )
-                        )
-                    case "DefChoice":
-                        member = StateMachineMemberDefChoice(
-                            AstNode.create_with_id(
-                                DefChoice(
-                                    data["name"],
-                                    translate_ident(data["guard"]),
-                                    translate_transition_expr(data["ifTransition"]),
-                                    translate_transition_expr(data["elseTransition"]),
-                                ),
-                                id,
-                            )
-                        )
-                    case "DefGuard":
-                        member = StateMachineMemberDefGuard(
-                            AstNode.create_with_id(
-                                DefGuard(
-                                    data["name"],
-                                    translate_optional(
-                                        data["typeName"], translate_type_name
-                                    ),
-                                ),
-                                id,
-                            )
-                        )
-                    case "DefSignal":
-                        member = StateMachineMemberDefSignal(
-                            AstNode.create_with_id(
-                                DefSignal(
-                                    data["name"],
-                                    translate_optional(
-                                        data["typeName"], translate_type_name
-                                    ),
-                                ),
-                                id,
-                            )
-                        )
-                    case "DefState":
-                        member = StateMachineMemberDefState(
-                            AstNode.create_with_id(
-                                DefState(
-                                    data["name"],
-                                    translate_state_members(data["members"]),
-                                ),
-                                id,
-                            )
-                        )
-                    case "SpecInitialTransition":
-                        member = StateMachineMemberDefSpecInitialTransition(
-                            AstNode.create_with_id(
-                                SpecInitialTransition(
-                                    translate_transition_expr(data["transition"])
-                                ),
-                                id,
-                            )
-                        )
-                    case _:
-                        raise InvalidFppToJsonField(k)
-                members.append(annotate(l[0], member, l[2]))
+    for pre, m_dict, post in read_optional(d) or []:
+        m_key = next(iter(m_dict))
+        entry = _STATE_MACHINE_MEMBERS.get(m_key)
+        if entry is None:
+            raise InvalidFppToJsonField(m_key)
+        wrap, translate = entry
+        data, id = read_ast_node(m_dict[m_key]["node"])
+        member = wrap(translate(data, id))
+        Annotations.put(id, pre, post)
+        members.append(member)
     return members
 
 
-def translate_ast_json(file: str):
-    if not os.path.exists(file):
-        raise FileNotFoundError(f'File "{file}" not found')
-    with open(file, "r") as f:
-        data: List[Dict] = json.load(f)
-        for d in data:
-            if isinstance(d, dict):
-                for k, v in d.items():
-                    translate_module_members(v)
-
-
-def translate_location_map_json(file: str) -> dict[AstId, Location]:
-    if not os.path.exists(file):
-        raise FileNotFoundError(f'File "{file}" not found')
-    with open(file, "r") as f:
-        data: Dict[str, dict] = json.load(f)
-        for k, v in data.items():
-            try:
-                Locations.put(
-                    int(k), Location(Path(v["file"]), v["pos"], v["includingLoc"])
-                )
-            except KeyError as e:
-                raise KeyError(f"Location map for ID {k} is missing required field {e}")
+def open_json(file: str) -> BinaryIO:
+    """Open a JSON file for reading in binary mode"""
+    try:
+        return open(file, "rb")
+    except FileNotFoundError:
+        raise FileNotFoundError(f'File "{file}" not found') from None
+
+
+def load_json(file: str) -> Any:
+    """Load a JSON file, using orjson if it is installed"""
+    with open_json(file) as f:
+        if orjson is None:
+            return json.load(f)
+        # Parse from a memory map rather than a copy of the file
+        # An empty file cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def iter_json_array(file: str) -> Iterator[Any]:
+    """
+    Iterate over the items of a JSON array file
+    If ijson is installed, parse one item at a time
+    """
+    # ijson is optional and only needed here, so import it on first use
+    try:
+        import ijson
+    except ImportError:
+        yield from load_json(file)
+        return
+    with open_json(file) as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def iter_json_object(file: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Iterate over the key-value pairs of a JSON object file
+    If ijson is installed, parse one pair at a time
+    """
+    try:
+        import ijson
+    except ImportError:
+        yield from load_json(file).items()
+        return
+    with open_json(file) as f:
+        yield from ijson.kvitems(f, "", use_float=True)
+
+
+def translate_ast_json(file: str, stream: bool = False) -> List[ModuleMember]:
+    """
+    Translate an fpp-to-json AST file to a list of module members
+    If stream is true, hold only one translation unit of JSON at a time
+    """
+    data = iter_json_array(file) if stream else load_json(file)
+    members = []
+    for d in data:
+        if isinstance(d, dict):
+            for k, v in d.items():
+                members.extend(translate_module_members(v))
+    return members
+
+
+def translate_location_map_json(file: str, stream: bool = False) -> LocationMap:
+    """
+    Translate an fpp-to-json location map file and store the locations
+    If stream is true, hold only one entry of JSON at a time
+    """
+    items = iter_json_object(file) if stream else load_json(file).items()
+    entries = []
+    try:
+        for k, v in items:
+            entries.append((int(k), v["file"], v["pos"], v["includingLoc"]))
+    except KeyError as e:
+        raise KeyError(
+            f"Location map for ID {k} is missing required field '{e.args[0]}'"
+        ) from None
+    Locations.put_all(entries)
     return Locations.get_map()